@@ -0,0 +1,33 @@
+"""
+Optional JIT compilation for the scanner's numeric kernels.
+
+Exposes an `njit` decorator that is `numba.njit` when numba is installed
+and a no-op otherwise, so the kernels still run (as plain Python) in
+environments without numba.  The leading underscore keeps Vercel from
+deploying this module as its own serverless function.
+"""
+
+import os
+
+# The deployment bundle is read-only; /tmp is the only writable place
+# numba can keep its on-disk compilation cache.
+os.environ.setdefault("NUMBA_CACHE_DIR", "/tmp/numba_cache")
+
+try:
+    from numba import njit
+    HAVE_NUMBA = True
+except ImportError:
+    HAVE_NUMBA = False
+
+    def njit(*args, **kwargs):
+        """
+        Stand-in for `numba.njit` that returns the function unchanged.
+        Supports both the bare `@njit` and the `@njit(...)` forms.
+        """
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+
+        def decorator(func):
+            return func
+
+        return decorator
@@ -7,61 +7,203 @@ fetches a list of tickers from the NASDAQ screener (filtered by
 computes basic technical indicators (SMA20, SMA50, RSI) to determine
 whether each symbol forms a breakout, pullback or bullish momentum setup.
 Up to three qualifying setups are returned.  All logic is contained
-inside the handler and helper functions; there is **no top‑level code**
-executed at import time.  Any unexpected exception is caught and
-logged, and the function returns an empty results list rather than
+inside the handler and helper functions; the only work done at import
+time is pointing yfinance's cache at /tmp and a warm-up call that
+JIT-compiles the indicator kernel.  Any unexpected exception is caught
+and logged, and the function returns an empty results list rather than
 propagating a 500 error.
 """
 
-import json
+import asyncio
+import os
 import re
+import threading
+import time
+from datetime import datetime, timedelta, timezone
 
+import httpx
 import pandas as pd
 import numpy as np
+import orjson
 import yfinance as yf
-import requests
+
+try:
+    from ._njit import njit
+except ImportError:
+    from _njit import njit
+
+# Strips everything but digits and the decimal point from a price
+_PRICE_RE = re.compile(r"[^\d.]")
+
+# Number of tickers downloaded per batched yfinance call
+BATCH_SIZE = 30
+
+# Minimum number of daily bars needed to evaluate a setup
+SETUP_LOOKBACK = 60
+
+# Calendar days of daily history downloaded per symbol: enough weeks to
+# hold SETUP_LOOKBACK trading days, plus a month of margin for market
+# holidays, rows dropped for missing values and today's bar not existing
+# before the open (at least ~76 sessions in practice).
+HISTORY_DAYS = SETUP_LOOKBACK * 7 // 5 + 30
+
+# Seconds for which screener data is reused.  Vercel keeps warm workers
+# (and therefore module globals) alive between invocations.
+SCREENER_TTL = 600
+_SCREENER_CACHE = {"ts": 0, "rows": None}
+_TICKERS_CACHE = {}
+
+# Daily bars are cached here as pickle files; /tmp is the only
+# writable directory on Vercel and persists while a worker is warm.
+HISTORY_CACHE_DIR = "/tmp"
+
+# While the US market is open a cached file is reused for this many
+# seconds only, so the current day's bar stays close to live.  Outside
+# trading hours a file written after the last close is complete and is
+# reused until the next open.
+HISTORY_TTL = 300
+MARKET_TZ = "America/New_York"
+
+# yfinance keeps ticker timezones and its Yahoo cookie/crumb in a sqlite
+# cache under the user cache directory.  That directory is read-only on
+# Vercel, in which case every download negotiates them again; keep the
+# cache in /tmp so warm invocations reuse it.
+yf.set_tz_cache_location(os.path.join(HISTORY_CACHE_DIR, "py-yfinance"))
 
 
 def parse_price(price_str):
     """
     Convert a price string like "$12.34" into a float.  Returns None if the
     string is blank or cannot be parsed.
+
+    Most screener prices are a plain "$NN.NN", so those are parsed with
+    `float` directly; the regex cleanup only runs for anything else
+    (thousands separators, stray characters).  Only plain ASCII decimals
+    take the fast path, so strings such as "inf", "nan" or "1e3" that
+    `float` would accept go through the regex like before.
     """
+    if not price_str or price_str == "N/A" or not isinstance(price_str, str):
+        return None
+    body = price_str[1:] if price_str[0] == "$" else price_str
+    if body.isascii() and body.replace(".", "", 1).isdigit():
+        return float(body)
     try:
-        if not price_str or price_str == "N/A":
-            return None
-        return float(re.sub(r"[^\d.]", "", price_str))
+        return float(_PRICE_RE.sub("", price_str))
     except Exception:
         return None
 
 
-def get_all_screener_data():
+SCREENER_EXCHANGES = ["nasdaq", "nyse", "amex"]
+
+# The HTTP client and the event loop it is bound to are kept for the
+# lifetime of the worker so keep-alive connections to nasdaq.com are
+# reused across warm invocations.  The loop runs on its own daemon
+# thread, so it can be used from any thread, including one that is
+# already running an event loop.
+_LOOP = None
+_LOOP_LOCK = threading.Lock()
+_CLIENT = None
+
+
+def _screener_client():
     """
-    Fetch stock screener rows from the NASDAQ API for NASDAQ, NYSE and AMEX.
+    Return the shared screener client, creating it on first use.
+    """
+    global _CLIENT
+    if _CLIENT is None:
+        _CLIENT = httpx.AsyncClient(
+            headers={"User-Agent": "Mozilla/5.0"},
+            transport=httpx.AsyncHTTPTransport(
+                retries=2,
+                limits=httpx.Limits(
+                    max_connections=8, max_keepalive_connections=4
+                ),
+            ),
+        )
+    return _CLIENT
+
 
-    Each exchange is queried independently.  If a request fails (due to
-    network issues or unexpected payloads), the error is logged and the
-    exchange is skipped.  The concatenated rows are returned as a
-    pandas DataFrame.
+def _run(coro):
+    """
+    Run `coro` on the worker's persistent event loop and wait for its
+    result.  `asyncio.run` would close the loop (and the pooled
+    connections) after every call.
     """
-    exchanges = ["nasdaq", "nyse", "amex"]
+    global _LOOP
+    with _LOOP_LOCK:
+        if _LOOP is None:
+            _LOOP = asyncio.new_event_loop()
+            threading.Thread(target=_LOOP.run_forever, daemon=True).start()
+    return asyncio.run_coroutine_threadsafe(coro, _LOOP).result()
+
+
+async def _fetch_exchange(client, semaphore, ex):
+    """
+    Fetch the screener rows for a single exchange.
+    """
+    url = (
+        "https://api.nasdaq.com/api/screener/stocks?tableonly=true"
+        f"&limit=5000&exchange={ex}"
+    )
+    async with semaphore:
+        resp = await client.get(url, timeout=10)
+    resp.raise_for_status()
+    data = resp.json()
+    return data.get("data", {}).get("table", {}).get("rows", [])
+
+
+async def fetch_screener_rows():
+    """
+    Query the NASDAQ screener for every exchange concurrently.
+
+    If a request fails (due to network issues or unexpected payloads),
+    the error is logged and the exchange is skipped.
+    """
+    semaphore = asyncio.Semaphore(len(SCREENER_EXCHANGES))
+    client = _screener_client()
+    tasks = [
+        _fetch_exchange(client, semaphore, ex) for ex in SCREENER_EXCHANGES
+    ]
+    responses = await asyncio.gather(*tasks, return_exceptions=True)
     all_rows = []
-    for ex in exchanges:
-        try:
-            url = (
-                "https://api.nasdaq.com/api/screener/stocks?tableonly=true"
-                f"&limit=5000&exchange={ex}"
-            )
-            headers = {"User-Agent": "Mozilla/5.0"}
-            resp = requests.get(url, headers=headers, timeout=10)
-            resp.raise_for_status()
-            data = resp.json()
-            rows = data.get("data", {}).get("table", {}).get("rows", [])
-            all_rows.extend(rows)
-        except Exception as err:
-            print(f"Error fetching screener for {ex}: {err}", flush=True)
+    for ex, rows in zip(SCREENER_EXCHANGES, responses):
+        if isinstance(rows, Exception):
+            print(f"Error fetching screener for {ex}: {rows}", flush=True)
             continue
-    return pd.DataFrame(all_rows)
+        all_rows.extend(rows)
+    return all_rows
+
+
+def get_all_screener_data():
+    """
+    Fetch stock screener rows from the NASDAQ API for NASDAQ, NYSE and AMEX.
+
+    The three exchanges are requested concurrently, so the wall time is
+    that of the slowest request rather than the sum of all three.  The
+    concatenated rows are returned as a list of dicts.  Results are kept
+    for `SCREENER_TTL` seconds so warm invocations skip the network.
+
+    If a refresh returns no rows (every exchange failed), the previous
+    rows are served instead, stale, and the refresh is retried on the
+    next call.  The ticker lists memoized by `get_tickers` stay
+    consistent with whatever rows are being served.
+    """
+    if (
+        _SCREENER_CACHE["rows"] is not None
+        and time.time() - _SCREENER_CACHE["ts"] < SCREENER_TTL
+    ):
+        return _SCREENER_CACHE["rows"]
+    rows = _run(fetch_screener_rows())
+    if not rows:
+        # Keep the timestamp unchanged so the next call retries
+        if _SCREENER_CACHE["rows"] is not None:
+            print("Screener refresh failed; serving stale rows", flush=True)
+            return _SCREENER_CACHE["rows"]
+        return rows
+    _SCREENER_CACHE["ts"] = time.time()
+    _SCREENER_CACHE["rows"] = rows
+    _TICKERS_CACHE.clear()
+    return rows
 
 
 def get_tickers(price_filter="all", limit=300):
@@ -78,96 +220,409 @@ def get_tickers(price_filter="all", limit=300):
     limit : int
         Maximum number of tickers to return.  The result is sorted by
         descending price to favour higher‑capitalization names.
+
+    Results are memoized per normalized filter and `limit` for as long
+    as the cached screener data they were built from.
     """
     try:
-        df = get_all_screener_data()
-        df = df.rename(columns={"symbol": "Symbol", "lastsale": "LastSale"})
-        df["Price"] = df["LastSale"].apply(parse_price)
-        # Remove rows with missing or non‑positive prices
-        df = df[["Symbol", "Price"]].dropna()
-        df = df[df["Price"] > 0]
-        f = price_filter.lower() if price_filter else "all"
-        if f in ("under_50", "under50"):
-            df = df[df["Price"] < 50]
-        elif f in ("over_50", "over50"):
-            df = df[df["Price"] >= 50]
-        df = df.sort_values("Price", ascending=False)
-        return df["Symbol"].head(limit).tolist()
+        f = price_filter.lower().replace("_", "") if price_filter else "all"
+        if f not in ("under50", "over50"):
+            f = "all"
+        rows = get_all_screener_data()
+        key = (f, limit)
+        if key in _TICKERS_CACHE:
+            return _TICKERS_CACHE[key]
+        symbols = np.array([r.get("symbol") or "" for r in rows], dtype=object)
+        # Unparseable (None) prices become NaN and fail the > 0 test below
+        prices = np.fromiter(
+            (parse_price(r.get("lastsale")) or np.nan for r in rows),
+            dtype=np.float64,
+            count=len(rows),
+        )
+        # Remove rows with missing symbols or missing/non‑positive prices
+        mask = (symbols != "") & (prices > 0)
+        if f == "under50":
+            mask &= prices < 50
+        elif f == "over50":
+            mask &= prices >= 50
+        symbols = symbols[mask]
+        prices = prices[mask]
+        # Partition out the `limit` highest prices and sort only those
+        # instead of sorting the whole screener.
+        if limit < len(prices):
+            idx = np.argpartition(prices, -limit)[-limit:]
+        else:
+            idx = np.arange(len(prices))
+        idx = idx[np.argsort(-prices[idx], kind="stable")]
+        tickers = symbols[idx].tolist()
+        if tickers:
+            _TICKERS_CACHE[key] = tickers
+        return tickers
     except Exception as err:
         print(f"Error loading tickers: {err}", flush=True)
         return []
 
 
+def download_batch(symbols):
+    """
+    Download the last `HISTORY_DAYS` calendar days of daily bars for
+    several symbols in one call.
+
+    yfinance fetches the symbols on its own worker threads and returns a
+    DataFrame whose columns are grouped by ticker.
+    """
+    start = datetime.now(timezone.utc) - timedelta(days=HISTORY_DAYS)
+    return yf.download(
+        tickers=list(symbols),
+        start=start.strftime("%Y-%m-%d"),
+        interval="1d",
+        group_by="ticker",
+        threads=True,
+        progress=False,
+    )
+
+
+def extract_symbol(data, symbol):
+    """
+    Pull the OHLCV frame for a single symbol out of a batched download.
+
+    Returns None if the symbol is missing from the download.  Rows with
+    missing values (e.g. dates on which only other symbols traded) are
+    dropped.
+    """
+    if isinstance(data.columns, pd.MultiIndex):
+        if symbol not in data.columns.get_level_values(0):
+            return None
+        df = data[symbol]
+    else:
+        df = data
+    # Drop dates on which this symbol did not trade (or has gaps); the
+    # rolling sums in the indicator kernel must not see NaN values.
+    df = df.dropna()
+    return df.rename(columns=str.capitalize)
+
+
+def _history_cache_path(symbol):
+    """
+    Path of the cached daily bars for `symbol`, keyed by the history
+    length so files written with a different window are not reused.
+    """
+    # Screener symbols such as "BRK/A" are not valid file names
+    name = symbol.replace("/", "-")
+    return os.path.join(HISTORY_CACHE_DIR, f"yf_{name}_{HISTORY_DAYS}d.pkl")
+
+
+def _last_close(now):
+    """
+    Return the most recent weekday session close (16:15 New York time,
+    leaving Yahoo a few minutes to settle the daily bar) at or before
+    `now`, and whether the market is open at `now`.  Holidays are
+    treated as trading days, which only costs extra downloads.
+    """
+    close = now.normalize() + pd.Timedelta(hours=16, minutes=15)
+    is_open = (
+        now.weekday() < 5
+        and now >= now.normalize() + pd.Timedelta(hours=9, minutes=30)
+        and now < close
+    )
+    if now < close:
+        close -= pd.Timedelta(days=1)
+    while close.weekday() >= 5:
+        close -= pd.Timedelta(days=1)
+    return close, is_open
+
+
+def _cache_is_fresh(path):
+    """
+    Whether the cached bars at `path` can be used instead of downloading.
+
+    Files younger than `HISTORY_TTL` are always fresh.  Older files are
+    only fresh while the market is closed, and only if they were written
+    after the last close, so they already hold that session's final bar
+    and no partial bar of the current one.
+    """
+    if not os.path.exists(path):
+        return False
+    mtime = os.path.getmtime(path)
+    if time.time() - mtime < HISTORY_TTL:
+        return True
+    last_close, is_open = _last_close(pd.Timestamp.now(tz=MARKET_TZ))
+    return not is_open and mtime >= last_close.timestamp()
+
+
+def load_history(symbols):
+    """
+    Return a dict mapping each symbol to its daily OHLCV frame.
+
+    Symbols with a fresh cached file are read from it; the rest are
+    fetched with a single batched download and then written to the
+    cache.  Symbols that could not be loaded are omitted.
+    """
+    history = {}
+    missing = []
+    for symbol in symbols:
+        path = _history_cache_path(symbol)
+        if _cache_is_fresh(path):
+            try:
+                history[symbol] = pd.read_pickle(path)
+                continue
+            except Exception as err:
+                print(f"Error reading cache for {symbol}: {err}", flush=True)
+        missing.append(symbol)
+    if not missing:
+        return history
+
+    try:
+        data = download_batch(missing)
+    except Exception as err:
+        print(f"Error downloading batch {missing[0]}..: {err}", flush=True)
+        return history
+    for symbol in missing:
+        df = extract_symbol(data, symbol)
+        if df is None or df.empty:
+            continue
+        history[symbol] = df
+        try:
+            df.to_pickle(_history_cache_path(symbol))
+        except Exception as err:
+            print(f"Error writing cache for {symbol}: {err}", flush=True)
+    return history
+
+
+@njit(cache=True)
+def _technicals_njit(closes):
+    """
+    Compute SMA20 and SMA50 for every column of the `(n_bars, n_tickers)`
+    input array, plus the RSI14 of each column's latest bar.
+
+    Columns may be NaN-padded at the top when histories differ in
+    length; each column's indicators start at its first valid bar.  The
+    SMA outputs have the same shape as the input and are NaN until their
+    window is filled.  Rolling sums are updated incrementally (add the
+    new bar, subtract the one leaving the window) instead of being
+    recomputed per bar.
+
+    RSI uses Wilder's smoothing: the average gain and loss are seeded
+    with the mean of the first 14 changes and then updated as
+    `avg = (avg * 13 + change) / 14`.
+    """
+    n, m = closes.shape
+    sma20 = np.full((n, m), np.nan)
+    sma50 = np.full((n, m), np.nan)
+    rsi = np.full(m, np.nan)
+
+    for c in range(m):
+        start = 0
+        while start < n and np.isnan(closes[start, c]):
+            start += 1
+        sum20 = 0.0
+        sum50 = 0.0
+        avg_up = 0.0
+        avg_down = 0.0
+        for k in range(start, n):
+            t = k - start
+            sum20 += closes[k, c]
+            sum50 += closes[k, c]
+            if t >= 20:
+                sum20 -= closes[k - 20, c]
+            if t >= 50:
+                sum50 -= closes[k - 50, c]
+            if t >= 19:
+                sma20[k, c] = sum20 / 20.0
+            if t >= 49:
+                sma50[k, c] = sum50 / 50.0
+
+            if t >= 1:
+                delta = closes[k, c] - closes[k - 1, c]
+                up = max(delta, 0.0)
+                down = max(-delta, 0.0)
+                if t <= 14:
+                    avg_up += up / 14.0
+                    avg_down += down / 14.0
+                else:
+                    avg_up = (avg_up * 13.0 + up) / 14.0
+                    avg_down = (avg_down * 13.0 + down) / 14.0
+        if n - start > 14:
+            if avg_down > 0:
+                rsi[c] = 100.0 - 100.0 / (1.0 + avg_up / avg_down)
+            elif avg_up > 0:
+                rsi[c] = 100.0
+    return sma20, sma50, rsi
+
+
+def _warm_up():
+    """
+    Run the indicator kernel once on dummy data so numba compiles (or
+    loads from its cache) during the cold start instead of inside the
+    first request.
+    """
+    bars = np.linspace(1.0, 2.0, SETUP_LOOKBACK).reshape(-1, 1)
+    _technicals_njit(bars)
+
+
+try:
+    _warm_up()
+except Exception as err:
+    print(f"Error warming up indicator kernel: {err}", flush=True)
+
+
+def _stack(frames, column, bars):
+    """
+    Stack the last `bars` values of `column` from each frame into a
+    `(bars, len(frames))` float array, aligned on the latest bar.
+    Shorter frames are NaN-padded at the top.
+    """
+    out = np.full((bars, len(frames)), np.nan)
+    for c, f in enumerate(frames):
+        values = f[column].to_numpy(dtype=np.float64)[-bars:]
+        out[bars - len(values):, c] = values
+    return out
+
+
+def detect_setups(frames):
+    """
+    Test many tickers for a setup in one vectorized pass: run the
+    indicator kernel over every frame and test the latest bar of each
+    for a breakout, pullback or bullish momentum setup.
+
+    Every frame should hold at least `SETUP_LOOKBACK` bars.  The full
+    histories are stacked (not just the trailing window) because
+    Wilder's RSI depends on every bar before the latest one.  Returns
+    the SMA20 and SMA50 arrays (one column per frame, aligned on the
+    latest bar and NaN-padded at the top), a boolean array of detected
+    setups and an array of setup descriptions.
+    """
+    bars = max(len(f) for f in frames)
+    opens = _stack(frames, "Open", bars)
+    highs = _stack(frames, "High", bars)
+    lows = _stack(frames, "Low", bars)
+    closes = _stack(frames, "Close", bars)
+    volumes = _stack(frames, "Volume", bars)
+
+    sma20, sma50, rsi = _technicals_njit(closes)
+
+    # Determine setup on the most recent bar of every column; NaN
+    # comparisons are False, so short windows never trigger a setup.
+    # Only the 20-bar high before that bar and the 20-bar average volume
+    # ending on it are needed, so those are taken directly.
+    i = bars - 1
+    high20_prev = np.full(closes.shape[1], np.nan)
+    avg_vol20 = np.full(closes.shape[1], np.nan)
+    if i >= 20:
+        high20_prev = highs[i - 20:i].max(axis=0)
+        avg_vol20 = volumes[i - 19:i + 1].mean(axis=0)
+    breakout = closes[i] > high20_prev
+    pullback = (
+        (closes[i] > sma50[i])
+        & (lows[i - 1] < sma20[i - 1])
+        & (closes[i] > closes[i - 1])
+    )
+    volume_spike = volumes[i] > avg_vol20 * 1.5
+    big_green = (closes[i] > opens[i]) & (closes[i] > highs[i - 1])
+    rsi_strength = rsi > 55
+    above_sma20 = closes[i] > sma20[i]
+    bullish = volume_spike & big_green & rsi_strength & above_sma20
+    valid = breakout | pullback | bullish
+    setups = np.where(
+        breakout,
+        "Breakout setup",
+        np.where(
+            pullback,
+            "Pullback & bounce setup",
+            np.where(bullish, "Bullish momentum setup", "No clear setup"),
+        ),
+    )
+    return sma20, sma50, valid, setups
+
+
 def calculate_technicals(df):
     """
     Compute SMA20, SMA50 and RSI arrays and determine if the
     latest bar triggers a breakout, pullback or bullish momentum setup.
 
-    The returned dictionary contains the SMA arrays, a boolean flag
+    The returned dictionary contains the SMA arrays (NumPy float arrays
+    with NaN for bars before the window is filled), a boolean flag
     `valid` indicating whether a setup was detected, and a `setup`
     description.
     """
-    closes = df["Close"].values
-    highs = df["High"].values
-    lows = df["Low"].values
-    volumes = df["Volume"].values
-
-    # Calculate SMAs
-    sma20 = pd.Series(closes).rolling(window=20).mean().tolist()
-    sma50 = pd.Series(closes).rolling(window=50).mean().tolist()
-
-    # RSI calculation
-    delta = np.diff(closes)
-    up = np.where(delta > 0, delta, 0)
-    down = np.where(delta < 0, -delta, 0)
-    roll_up = pd.Series(up).rolling(14).mean()
-    roll_down = pd.Series(down).rolling(14).mean()
-    rs = roll_up / roll_down
-    rsi = (100 - (100 / (1 + rs))).tolist()
-
-    def pad(arr, length):
-        diff = length - len(arr)
-        return [None] * diff + arr
-
-    sma20 = pad(sma20, len(closes))
-    sma50 = pad(sma50, len(closes))
-    rsi = pad(rsi, len(closes))
-
-    # Determine setup on the most recent bar
-    i = len(closes) - 1
-    high20 = pd.Series(highs).rolling(window=20).max().tolist()
-    avg_vol20 = pd.Series(volumes).rolling(window=20).mean().tolist()
-    high20 = pad(high20, len(closes))
-    avg_vol20 = pad(avg_vol20, len(closes))
-    breakout = closes[i] > high20[i - 1] if i - 1 >= 0 else False
-    pullback = (
-        sma50[i] is not None and closes[i] > sma50[i]
-        and i - 1 >= 0
-        and sma20[i - 1] is not None and lows[i - 1] < sma20[i - 1]
-        and closes[i] > closes[i - 1]
-    )
-    volume_spike = avg_vol20[i] is not None and volumes[i] > avg_vol20[i] * 1.5
-    big_green = i - 1 >= 0 and closes[i] > df["Open"].iloc[i] and closes[i] > highs[i - 1]
-    rsi_strength = rsi[i] is not None and rsi[i] > 55
-    above_sma20 = sma20[i] is not None and closes[i] > sma20[i]
-    bullish = volume_spike and big_green and rsi_strength and above_sma20
-    valid = breakout or pullback or bullish
-    if breakout:
-        setup_desc = "Breakout setup"
-    elif pullback:
-        setup_desc = "Pullback & bounce setup"
-    elif bullish:
-        setup_desc = "Bullish momentum setup"
-    else:
-        setup_desc = "No clear setup"
+    sma20, sma50, valid, setups = detect_setups([df])
     return {
-        "sma20": sma20,
-        "sma50": sma50,
-        "valid": valid,
-        "setup": setup_desc,
+        "sma20": np.ascontiguousarray(sma20[:, 0]),
+        "sma50": np.ascontiguousarray(sma50[:, 0]),
+        "valid": bool(valid[0]),
+        "setup": str(setups[0]),
     }
 
 
+def scan_batch(batch, history, wanted):
+    """
+    Return up to `wanted` result dicts for the symbols in `batch` that
+    form a setup, in batch order.  `history` maps symbols to their daily
+    bars as returned by `load_history`.
+    """
+    results = []
+    symbols = [
+        sym for sym in batch
+        if sym in history and len(history[sym]) >= SETUP_LOOKBACK
+    ]
+    if not symbols:
+        return results
+    try:
+        sma20, sma50, valid, setups = detect_setups(
+            [history[sym] for sym in symbols]
+        )
+    except Exception as err:
+        print(f"Error detecting setups for {symbols[0]}..: {err}", flush=True)
+        return results
+    for k in np.flatnonzero(valid):
+        if len(results) >= wanted:
+            break
+        symbol = symbols[k]
+        try:
+            df = history[symbol]
+            # Columns are aligned on the latest bar; drop the padding
+            n = len(df)
+            results.append({
+                "symbol": symbol,
+                "dates": df.index.strftime("%Y-%m-%d").tolist(),
+                "opens": df["Open"].to_numpy(),
+                "highs": df["High"].to_numpy(),
+                "lows": df["Low"].to_numpy(),
+                "closes": df["Close"].to_numpy(),
+                "sma20": np.ascontiguousarray(sma20[-n:, k]),
+                "sma50": np.ascontiguousarray(sma50[-n:, k]),
+                "setup": str(setups[k]),
+            })
+        except Exception as err:
+            # Skip this symbol on any error; log for debugging
+            print(f"Error processing {symbol}: {err}", flush=True)
+            continue
+    return results
+
+
+def _json_default(obj):
+    """
+    Fallback for values orjson cannot encode natively, such as NumPy
+    arrays that are not C-contiguous.
+    """
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+def dump_json(payload):
+    """
+    Serialize a response payload with orjson.
+
+    NumPy arrays are encoded natively, without building intermediate
+    Python lists, and NaN (the indicator padding) is written as null,
+    which the frontend treats as a gap.
+    """
+    return orjson.dumps(
+        payload, default=_json_default, option=orjson.OPT_SERIALIZE_NUMPY
+    ).decode()
+
+
 def handler(request):
     """
     Vercel entrypoint for the stock scanner.
@@ -196,37 +651,20 @@ def handler(request):
 
         tickers = get_tickers(price_filter, limit=300)
         results = []
-        for symbol in tickers:
+        # Download price history in batches so yfinance can fetch the
+        # symbols concurrently.  Only the next batch is requested when
+        # the previous one did not yield enough setups.
+        for start in range(0, len(tickers), BATCH_SIZE):
             if len(results) >= 3:
                 break
-            try:
-                df = yf.download(symbol, period="6mo", interval="1d", progress=False)
-                if df.empty or len(df) < 60:
-                    continue
-                df = df.rename(columns=str.capitalize)
-                tech = calculate_technicals(df)
-                if not tech.get("valid"):
-                    continue
-                results.append({
-                    "symbol": symbol,
-                    "dates": [d.strftime("%Y-%m-%d") for d in df.index],
-                    "opens": df["Open"].tolist(),
-                    "highs": df["High"].tolist(),
-                    "lows": df["Low"].tolist(),
-                    "closes": df["Close"].tolist(),
-                    "sma20": tech["sma20"],
-                    "sma50": tech["sma50"],
-                    "setup": tech["setup"],
-                })
-            except Exception as err:
-                # Skip this symbol on any error; log for debugging
-                print(f"Error processing {symbol}: {err}", flush=True)
-                continue
+            batch = tickers[start:start + BATCH_SIZE]
+            history = load_history(batch)
+            results.extend(scan_batch(batch, history, 3 - len(results)))
 
         return {
             "statusCode": 200,
             "headers": {"Content-Type": "application/json"},
-            "body": json.dumps({"results": results}),
+            "body": dump_json({"results": results}),
         }
     except Exception as err:
         # Catch any unexpected failure to avoid a 500 error
@@ -234,5 +672,5 @@ def handler(request):
         return {
             "statusCode": 200,
             "headers": {"Content-Type": "application/json"},
-            "body": json.dumps({"results": []}),
+            "body": dump_json({"results": []}),
         }